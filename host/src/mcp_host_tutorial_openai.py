@@ -11,19 +11,26 @@ Usage -> ``python mcp_openai_tutorial.py``
 """
 
 import asyncio
-import json
+import hashlib
 import os
 from contextlib import AsyncExitStack
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
 
+import orjson
+from diskcache import Cache
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 from openai.types.responses import Response, ResponseFunctionToolCall
-from pydantic import BaseModel
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from mcp.types import Tool
+from mcp.types import TextContent, Tool
+
+try:  # libuv-based event loop; not available on Windows
+    import uvloop
+except ImportError:  # pragma: no cover - platform dependent
+    uvloop = None
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -31,6 +38,8 @@ from mcp.types import Tool
 
 MODEL_NAME = "gpt-4.1"
 TOOL_SEPARATOR = "__"  # unique separator to avoid name clashes across servers
+TOOL_CACHE_DIR = ".tool_cache"  # on-disk tool results, shared across sessions
+TOOL_CACHE_TTL = 24 * 60 * 60  # seconds
 
 # ---------------------------------------------------------------------------
 # Raw server configuration (edit this to add/remove MCP servers)
@@ -54,7 +63,8 @@ RAW_CONFIG: Dict[str, dict] = {
 # ---------------------------------------------------------------------------
 
 
-class MCPServer(BaseModel):
+@dataclass(slots=True)
+class MCPServer:
     """Definition of a single MCP server instance."""
 
     name: str
@@ -80,86 +90,212 @@ def mcp_tool_to_openai_tool(tool: Tool, server_name: str) -> dict:
     }
 
 
+async def serve(
+    server: MCPServer, started: "asyncio.Future[List[Tool]]", stop: asyncio.Event
+) -> None:
+    """Run one MCP server until ``stop`` is set.
+
+    ``stdio_client`` owns an anyio task group that must be exited from the task
+    that entered it, so each server lives in a task of its own.  The server's
+    tools are reported through ``started`` once the handshake is done.
+    """
+    try:
+        async with AsyncExitStack() as stack:
+            read, write = await stack.enter_async_context(
+                stdio_client(
+                    StdioServerParameters(
+                        command=server.command, args=server.args, env=server.env
+                    )
+                )
+            )
+            server.session = await stack.enter_async_context(
+                ClientSession(read, write)
+            )
+            # Not pipelined: MCP requires the initialize response (and the
+            # ``initialized`` notification it triggers) before any other
+            # request.  Overlap comes from starting all servers concurrently.
+            await server.session.initialize()
+
+            response = await server.session.list_tools()
+            started.set_result(response.tools)
+            await stop.wait()
+    except Exception as exc:
+        if not started.done():
+            started.set_exception(exc)
+        raise
+    finally:
+        if not started.done():
+            started.cancel()
+
+
 async def init_servers(
     stack: AsyncExitStack, servers: Dict[str, MCPServer]
 ) -> List[dict]:
-    """Launch all MCP servers and aggregate their tools in OpenAI format."""
-    openai_tools: List[dict] = []
+    """Launch all MCP servers concurrently and aggregate their tools in OpenAI format."""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    started = {name: loop.create_future() for name in servers}
+    tasks = [
+        asyncio.create_task(serve(server, started[name], stop))
+        for name, server in servers.items()
+    ]
 
-    for server in servers.values():
-        read, write = await stack.enter_async_context(
-            stdio_client(
-                StdioServerParameters(
-                    command=server.command, args=server.args, env=server.env
-                )
-            )
-        )
-        server.session = await stack.enter_async_context(ClientSession(read, write))
-        await server.session.initialize()
+    async def shutdown() -> None:
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-        response = await server.session.list_tools()
-        print(f"[{server.name}] available tools → {[t.name for t in response.tools]}")
+    stack.push_async_callback(shutdown)
 
-        for t in response.tools:
+    openai_tools: List[dict] = []
+    try:
+        results = await asyncio.gather(*started.values())
+    except BaseException:
+        # A server stuck in its handshake never reaches ``stop.wait()``, so
+        # ``shutdown`` alone would wait on it forever.
+        for task in tasks:
+            task.cancel()
+        raise
+
+    for server, tools in zip(servers.values(), results):
+        print(f"[{server.name}] available tools → {[t.name for t in tools]}")
+
+        for t in tools:
             openai_tools.append(mcp_tool_to_openai_tool(t, server.name))
 
     return openai_tools
 
 
+def tool_cache_key(server_name: str, tool_name: str, args: dict) -> str:
+    """Stable key for a tool invocation, independent of argument order."""
+    payload = orjson.dumps(
+        [server_name, tool_name, args], option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
 async def dispatch_tool_call(
-    tool_call: ResponseFunctionToolCall, servers: Dict[str, MCPServer]
+    tool_call: ResponseFunctionToolCall,
+    sessions: Dict[str, ClientSession],
+    cache: Cache,
 ) -> str:
-    """Execute the requested MCP tool and return its string output."""
-    args = json.loads(tool_call.arguments)
-    server_name, tool_name = tool_call.name.split(TOOL_SEPARATOR)
-    session = servers[server_name].session
-    result = await session.call_tool(name=tool_name, arguments=args)
-    return str(result.content[0].text)
+    """Execute the requested MCP tool and return its text output.
+
+    A tool may answer with several content blocks (FastMCP emits one per item
+    of a returned list), so all text blocks are joined line by line.
+    Successful outputs are cached on disk so repeated runs skip the tool; the
+    cache does blocking SQLite/file I/O, so it is accessed off the event loop.
+    """
+    args = orjson.loads(tool_call.arguments)
+    # Server names never contain the separator, but tool names may.
+    server_name, _, tool_name = tool_call.name.partition(TOOL_SEPARATOR)
+
+    loop = asyncio.get_running_loop()
+    key = tool_cache_key(server_name, tool_name, args)
+    cached = await loop.run_in_executor(None, cache.get, key)
+    if cached is not None:
+        return cached
+
+    result = await sessions[server_name].call_tool(name=tool_name, arguments=args)
+    output = "\n".join(c.text for c in result.content if isinstance(c, TextContent))
+    if not result.isError:
+        await loop.run_in_executor(None, cache.set, key, output, TOOL_CACHE_TTL)
+    return output
+
+
+def print_cache_stats(cache: Cache) -> None:
+    """Report tool-cache hits and misses for this session."""
+    hits, misses = cache.stats()
+    print(f"[tool cache] hits={hits} misses={misses}")
+
+
+async def run_model_turn(
+    client: AsyncOpenAI,
+    sessions: Dict[str, ClientSession],
+    cache: Cache,
+    **call_kwargs: Any,
+) -> Tuple[Response, List[dict]]:
+    """Stream one model response, returning it with the outputs of its tool calls.
+
+    Each tool call is dispatched as soon as the stream reports it complete, so
+    tools run while the model is still generating the rest of its output.
+    """
+    pending: List[Tuple[ResponseFunctionToolCall, asyncio.Task]] = []
+    try:
+        async with client.responses.stream(**call_kwargs) as stream:
+            async for event in stream:
+                if event.type == "response.output_item.done" and isinstance(
+                    event.item, ResponseFunctionToolCall
+                ):
+                    task = asyncio.create_task(
+                        dispatch_tool_call(event.item, sessions, cache)
+                    )
+                    pending.append((event.item, task))
+            response = await stream.get_final_response()
+
+        outputs = await asyncio.gather(*(task for _, task in pending))
+    except BaseException:
+        for _, task in pending:
+            task.cancel()
+        raise
+
+    tool_outputs = [
+        {
+            "type": "function_call_output",
+            "call_id": tc.call_id,
+            "output": output,
+        }
+        for (tc, _), output in zip(pending, outputs)
+    ]
+    return response, tool_outputs
 
 
 async def chat_loop(servers: Dict[str, MCPServer]) -> None:
     """Interactive REPL: forwards user input to the model and handles tool calls."""
     load_dotenv()
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
     async with AsyncExitStack() as stack:
         tools = await init_servers(stack, servers)
+        base_request = {"model": MODEL_NAME, "tools": tools}
+        sessions = {name: server.session for name, server in servers.items()}
+        cache = stack.enter_context(Cache(TOOL_CACHE_DIR))
+        cache.stats(enable=True, reset=True)
+        stack.callback(print_cache_stats, cache)
         previous_id: Optional[str] = None
+        loop = asyncio.get_running_loop()
 
         while True:
-            user_text = await asyncio.to_thread(input, "You: ")
+            user_text = await loop.run_in_executor(None, input, "You: ")
             if user_text.strip().lower() in {"exit", "quit"}:
                 break
 
             call_kwargs = {
-                "model": MODEL_NAME,
+                **base_request,
                 "input": [{"role": "user", "content": user_text}],
-                "tools": tools,
             }
             if previous_id:
                 call_kwargs["previous_response_id"] = previous_id
 
-            response: Response = client.responses.create(**call_kwargs)
-
-            # Handle tool chains until we get plain‑text output
-            while isinstance(response.output[0], ResponseFunctionToolCall):
-                tool_call = response.output[0]
-                tool_output = await dispatch_tool_call(tool_call, servers)
+            response, tool_outputs = await run_model_turn(
+                client, sessions, cache, **call_kwargs
+            )
 
-                response = client.responses.create(
-                    model=MODEL_NAME,
+            # Handle tool chains until we get plain‑text output.  The model may
+            # request several tools in one turn; answer all of them at once.
+            # ``previous_response_id`` carries the conversation but not the
+            # tool definitions, so ``tools`` must be sent with every request
+            # or the model loses them mid-chain; ``input`` holds only new items.
+            while tool_outputs:
+                response, tool_outputs = await run_model_turn(
+                    client,
+                    sessions,
+                    cache,
+                    **base_request,
                     previous_response_id=response.id,
-                    input=[
-                        {
-                            "type": "function_call_output",
-                            "call_id": tool_call.call_id,
-                            "output": tool_output,
-                        }
-                    ],
-                    tools=tools,
+                    input=tool_outputs,
                 )
 
-            assistant_message = response.output[0].content[0].text
+            assistant_message = response.output_text
             previous_id = response.id
             print(f"Assistant: {assistant_message}\n")
 
@@ -176,7 +312,8 @@ def build_servers(raw: Dict[str, dict]) -> Dict[str, MCPServer]:
 
 def main() -> None:
     servers = build_servers(RAW_CONFIG)
-    asyncio.run(chat_loop(servers))
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(chat_loop(servers))
 
 
 if __name__ == "__main__":
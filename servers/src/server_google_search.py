@@ -1,5 +1,10 @@
 from mcp.server.fastmcp import FastMCP
-from googleapiclient.discovery import build
+import aiohttp
+import asyncio
+import orjson
+from cachetools import TTLCache
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
 
@@ -10,22 +15,73 @@ load_dotenv()  # Load environment variables from .env file
 API_KEY = os.getenv("GOOGLE_CSE_API_KEY")  # or paste literal string
 CX_ID = os.getenv("GOOGLE_CSE_ID")  # your search-engine ID
 
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+# Parameters shared by every search; the credentials and ``q`` are added per call.
+SEARCH_PARAMS: dict[str, str | int] = {"num": 5, "gl": "jp", "lr": "lang_ja"}
+
+# Search results keyed by normalized query; the agent often repeats the same
+# query within one session, so skip the API round-trip for an hour.
+# Results are cached already serialized, so a hit does no encoding at all.
+CACHE_TTL_SECONDS = 60 * 60
+_cache: TTLCache = TTLCache(maxsize=256, ttl=CACHE_TTL_SECONDS)
+
+
+def _cache_key(query: str) -> str:
+    """Normalize case and whitespace so trivially different queries share a key."""
+    return " ".join(query.split()).lower()
+
+
+# Searches currently in flight, by cache key.  Concurrent identical queries
+# share one request instead of each hitting the API.
+_inflight: dict[str, asyncio.Task] = {}
+
+
+# One HTTP session for the lifetime of the server so connections are pooled
+# across searches.  Created lazily because it must live on the running loop.
+_session: aiohttp.ClientSession | None = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    # No await between the check and the assignment, so concurrent tool calls
+    # on the loop cannot race to create two sessions.
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=20, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=60
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the pooled HTTP session when the MCP server shuts down."""
+    try:
+        yield
+    finally:
+        if _session is not None:
+            await _session.close()
+
+
 mcp = FastMCP(
     "google_search_server",
     instructions="google the given query, and return the first 5 results. treat the user as searching from japan, and perfer Japanese-language results.",
+    lifespan=lifespan,
 )
 
 
-@mcp.tool()
-def google_search(query: str) -> list[dict]:
-    """
-    google the given query, and return the first 5 results. treat the user as searching from japan, and perfer Japanese-language results.
-
-    Args:
-        query (str): The search query.
-    """
-    service = build("customsearch", "v1", developerKey=API_KEY)
-    resp = service.cse().list(q=query, cx=CX_ID, num=5, gl="jp", lr="lang_ja").execute()
+async def _search(query: str, key: str) -> str:
+    """Call the Custom Search API and cache the cleaned results as JSON."""
+    # Checked here rather than at import so a missing key only fails searches;
+    # FastMCP reports the error to the host as a tool error.
+    if not API_KEY or not CX_ID:
+        raise RuntimeError(
+            "GOOGLE_CSE_API_KEY and GOOGLE_CSE_ID must be set (see .env.sample)"
+        )
+    params = {**SEARCH_PARAMS, "key": API_KEY, "cx": CX_ID, "q": query}
+    async with _get_session().get(SEARCH_URL, params=params) as http_resp:
+        http_resp.raise_for_status()
+        resp = await http_resp.json()
     items = resp.get("items", [])
     cleaned = []
 
@@ -43,7 +99,33 @@ def google_search(query: str) -> list[dict]:
                 "published_at": published,  # may be None
             }
         )
-    return str(cleaned)
+    # A single compact JSON text block; returning the list would make FastMCP
+    # emit one indented block per result.
+    result = orjson.dumps(cleaned).decode()
+    _cache[key] = result
+    return result
+
+
+@mcp.tool()
+async def google_search(query: str) -> str:
+    """
+    google the given query, and return the first 5 results. treat the user as searching from japan, and perfer Japanese-language results.
+
+    Args:
+        query (str): The search query.
+    """
+    key = _cache_key(query)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_search(query, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: one caller being cancelled must not cancel the shared search
+    return await asyncio.shield(task)
 
 
 if __name__ == "__main__":